@@ -1,16 +1,22 @@
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
+import hashlib
+import orjson
 import os
 from app.services import price_service, reporting_service
 from app.core.config import settings
-from app.utils.logging_utils import log_message # For logging API errors if needed
 
 # Renamed 'app' to 'app_router' to avoid conflict with FastAPI instance in main.py
 app_router = APIRouter(prefix="/api")
 
+# Rows serialized per chunk when streaming the price history.
+_HISTORY_CHUNK_ROWS = 10_000
+
 
 @app_router.get("/health")
-def health_check():
+async def health_check():
     """
     Health check endpoint to verify if the server is running.
     
@@ -20,42 +26,50 @@ def health_check():
     return {"status": "ok", "message": "Price Watcher API is running."}
 
 @app_router.get("/history/text")
-def get_history_text():
+async def get_history_text():
     """
-    Fetch the historical price data in CSV format and return related statistics.
-    
-    Reads a CSV file containing historical price data, returns it as a JSON object, 
-    and includes the statistics (total entries, min, max, and average price).
+    Fetch the historical price data and return related statistics.
+
+    Streams the price history as a JSON object instead of buffering the full
+    list of records in one response body, so peak memory stays O(chunk).
 
     Returns:
         JSON object with 'data' containing the historical price records and 'metadata'
         containing statistics such as total entries, min price, max price, and average price.
-    
+
     Raises:
-        HTTPException: If the file is not found, a 404 error is returned.
+        HTTPException: If the history cannot be read, a 500 error is returned.
     """
-    try:
-        df_history = price_service.get_all_prices_df()
-        # Convert DataFrame to list of dicts, 'date' column from df is used as 'timestamp'
-        data = df_history.rename(columns={'date': 'timestamp'}).to_dict(orient='records')
-        
-        stats = price_service.get_price_statistics()
-
-        return {
-            "data": data,
-            "metadata": stats
-        }
-    except Exception as e:
-        log_message(f"API Error in /history/text: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    stats = await asyncio.to_thread(price_service.get_price_statistics)
+
+    # The DB timestamp is exposed as 'timestamp'. The generator is sync, so
+    # Starlette iterates it in a worker thread; each chunk is fetched from
+    # the cursor, serialized, and released before the next one, keeping both
+    # the row objects and the JSON buffer bounded by the chunk size.
+    def stream_history():
+        yield b'{"data":['
+        first = True
+        for rows in price_service.iter_price_chunks(_HISTORY_CHUNK_ROWS):
+            if not first:
+                yield b","
+            first = False
+            yield b",".join(
+                orjson.dumps({"timestamp": ts, "price": price})
+                for ts, price in rows
+            )
+        yield b'],"metadata":' + orjson.dumps(stats) + b'}'
+
+    return StreamingResponse(stream_history(), media_type="application/json")
 
 
 @app_router.get("/history/image")
-def get_history_image():
+async def get_history_image(request: Request):
     """
     Retrieve the price history image (PNG).
-    
-    Returns the PNG image that visualizes the historical price data.
+
+    Returns the PNG image that visualizes the historical price data. The
+    response carries an ETag derived from the file's mtime so clients holding
+    the current graph get a 304 instead of the full image.
 
     Returns:
         FileResponse: The image file as a response with the correct MIME type.
@@ -63,18 +77,20 @@ def get_history_image():
     Raises:
         HTTPException: If the image is not found, a 404 error is returned.
     """
-    try:
-        image_path = reporting_service.generate_price_history_graph() # Ensures latest graph
-        if image_path and os.path.exists(image_path):
-            return FileResponse(image_path, media_type="image/png")
-        else:
-            raise HTTPException(status_code=404, detail=f"Image not found or could not be generated.")
-    except Exception as e:
-        log_message(f"API Error in /history/image: {e}")
-        raise HTTPException(status_code=500, detail=f"Error retrieving image: {str(e)}")
+    image_path = await asyncio.to_thread(reporting_service.generate_price_history_graph) # Ensures latest graph
+    if not image_path or not os.path.exists(image_path):
+        raise HTTPException(status_code=404, detail="Image not found or could not be generated.")
+    etag = hashlib.md5(f"{image_path}-{os.path.getmtime(image_path)}".encode()).hexdigest()
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304)
+    return FileResponse(
+        image_path,
+        media_type="image/png",
+        headers={"ETag": etag, "Cache-Control": "max-age=60"},
+    )
 
 @app_router.get("/latest-price")
-def get_latest_price():
+async def get_latest_price():
     """
     Retrieve the latest recorded price.
 
@@ -84,19 +100,13 @@ def get_latest_price():
     Raises:
         HTTPException: If there is an error reading the database or no data is found.
     """
-    try:
-        latest_entry = price_service.get_latest_price()
-        if not latest_entry:
-            raise HTTPException(status_code=404, detail="No price data found in database.")
-        return {"timestamp": latest_entry[0], "latest_price": latest_entry[1]}
-    except HTTPException: # Re-raise HTTP exceptions from db module if any
-        raise
-    except Exception as e:
-        log_message(f"API Error in /latest-price: {e}")
-        raise HTTPException(status_code=500, detail=f"Error retrieving latest price: {str(e)}")
+    latest_entry = await asyncio.to_thread(price_service.get_latest_price)
+    if not latest_entry:
+        raise HTTPException(status_code=404, detail="No price data found in database.")
+    return {"timestamp": latest_entry[0], "latest_price": latest_entry[1]}
 
 @app_router.get("/stats")
-def get_stats():
+async def get_stats():
     """
     Calculate and return statistics on the historical prices.
     
@@ -108,16 +118,10 @@ def get_stats():
     Raises:
         HTTPException: If there is an error reading the file or calculating statistics, a 500 error is returned.
     """
-    try:
-        return price_service.get_price_statistics()
-    except HTTPException: # Re-raise HTTP exceptions from get_stats_data_from_db
-        raise
-    except Exception as e: # Catch other potential errors
-        log_message(f"API Error in /stats: {e}")
-        raise HTTPException(status_code=500, detail=f"Error retrieving statistics: {str(e)}")
+    return await asyncio.to_thread(price_service.get_price_statistics)
 
 @app_router.post("/trigger")
-def trigger_iteration():
+async def trigger_iteration():
     """
     Manually trigger a new price iteration.
     
@@ -126,9 +130,5 @@ def trigger_iteration():
     Returns:
         JSON object with a confirmation message that the manual trigger was executed.
     """
-    try:
-        price_service.process_new_price_iteration()
-        return {"message": "Manual price check iteration triggered successfully."}
-    except Exception as e:
-        log_message(f"API Error in /trigger: {e}")
-        raise HTTPException(status_code=500, detail=f"Error triggering iteration: {str(e)}")
+    await asyncio.to_thread(price_service.process_new_price_iteration)
+    return {"message": "Manual price check iteration triggered successfully."}
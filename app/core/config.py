@@ -1,8 +1,12 @@
 import os
 from dotenv import load_dotenv
 
-# Load .env file from the project root (one level up from app/core)
-dotenv_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), '.env')
+# Project root (two levels up from app/core), resolved once and reused for
+# every derived path below instead of rebuilding the dirname chain each time.
+_BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+# Load .env file from the project root
+dotenv_path = os.path.join(_BASE_DIR, '.env')
 load_dotenv(dotenv_path=dotenv_path)
 
 class Settings:
@@ -21,9 +25,9 @@ class Settings:
     DB_PASSWORD: str | None = os.getenv("DB_PASSWORD")
     DB_NAME: str | None = os.getenv("DB_NAME")
 
-    DB_FILE: str = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data", "price_watcher.db")
-    LOG_FILE: str = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data", "price_watcher.log")
-    HISTORY_IMAGE_PATH: str = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data", "price_history.png")
+    DB_FILE: str = os.path.join(_BASE_DIR, "data", "price_watcher.db")
+    LOG_FILE: str = os.path.join(_BASE_DIR, "data", "price_watcher.log")
+    HISTORY_IMAGE_PATH: str = os.path.join(_BASE_DIR, "data", "price_history.png")
     MAX_LOG_SIZE: int = 1_048_576  # 1 MB
     API_HOST: str = "0.0.0.0"
     API_PORT: int = 8000
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Tuple, Optional, Any
+from typing import Iterator, List, Dict, Tuple, Optional, Any
 
 class BasePriceCRUD(ABC):
     @abstractmethod
@@ -20,16 +21,48 @@ class BasePriceCRUD(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_all_price_entries_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Retrieves all price entries as two aligned numpy arrays
+           (timestamps, prices). Cheaper than the DataFrame form for callers
+           that only serialize the columns.
+        """
+        pass
+
+    @abstractmethod
+    def iter_price_entry_chunks(self, chunk_rows: int) -> Iterator[List[Tuple[str, float]]]:
+        """Yields (timestamp, price) rows in chronological order, chunk_rows
+           at a time, without materializing the whole history. For callers
+           that stream the data onwards (e.g. the history API endpoint).
+        """
+        pass
+
     @abstractmethod
     def get_latest_price_entry(self) -> Optional[Tuple[str, float]]:
         """Retrieves the latest price entry (timestamp, price)."""
         pass
 
+    @abstractmethod
+    def get_history_fingerprint(self) -> Optional[Tuple[Any, int]]:
+        """Returns a cheap (latest timestamp, row count) fingerprint of the
+           price history, or None when the history is empty. Used to detect
+           whether derived artifacts (e.g. the history graph) are stale.
+        """
+        pass
+
     @abstractmethod
     def delete_all_prices(self) -> None:
         """Deletes all price entries."""
         pass
 
+    @abstractmethod
+    def compact_history(self) -> int:
+        """Removes redundant price entries: within each week whose price never
+           changed, only the earliest entry is kept. Returns the number of
+           rows removed.
+        """
+        pass
+
     @abstractmethod
     def bulk_insert_prices(self, price_entries: List[Dict[str, Any]]) -> None:
         """Bulk inserts price entries. Each dict should have 'timestamp' and 'price'."""
@@ -40,4 +73,11 @@ class BasePriceCRUD(ABC):
         """Calculates and returns price statistics.
            Expected keys: 'total_entries', 'min_price', 'max_price', 'average_price'.
         """
+        pass
+
+    @abstractmethod
+    def recompute_stats(self) -> None:
+        """Rebuilds the incrementally maintained stats from the full price history.
+           Used to bootstrap the stats storage or repair it after manual edits.
+        """
         pass
\ No newline at end of file
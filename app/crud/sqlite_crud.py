@@ -1,122 +1,319 @@
 import sqlite3
+import threading
+import time
+
+import numpy as np
 import pandas as pd
 import os
 from datetime import datetime
 from app.utils.logging_utils import log_message
 from .base import BasePriceCRUD # Import the base class
-from typing import List, Dict, Tuple, Optional, Any
+from typing import Iterator, List, Dict, Tuple, Optional, Any
+
+# Hot-path statement reused on every scrape tick; a stable string keeps it
+# resident in the connection's prepared-statement cache.
+_INSERT_PRICE_SQL = "INSERT INTO prices (timestamp, price) VALUES (?, ?)"
 
 class SQLitePriceCRUD(BasePriceCRUD):
     def __init__(self, db_path: str):
         self.db_path = db_path
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self._local = threading.local()
 
     def _get_connection(self):
-        return sqlite3.connect(self.db_path)
+        """Return this thread's persistent connection, opening it on first use.
+
+        Connections are kept open per thread (the API serves requests from a
+        thread pool) so each query skips the connect/close cycle and reuses
+        SQLite's prepared-statement cache and warm page cache. WAL mode lets
+        readers proceed concurrently with the watcher's writes.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # isolation_level=None puts the connection in autocommit mode;
+            # multi-statement writers open explicit BEGIN IMMEDIATE blocks so
+            # Python's implicit-transaction bookkeeping stays off the hot path.
+            conn = sqlite3.connect(self.db_path, isolation_level=None, cached_statements=256)
+            # journal_mode=WAL is persistent in the database file and is set
+            # once in init_db; the remaining PRAGMAs are per-connection.
+            conn.execute("PRAGMA synchronous=NORMAL")
+            # Memory-map the database file and enlarge the page cache so the
+            # full-history scans behind the graph/JSON endpoints read pages
+            # without per-page syscalls; spill temp structures to RAM.
+            conn.execute("PRAGMA mmap_size=268435456")
+            conn.execute("PRAGMA cache_size=-20000")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            self._local.conn = conn
+        return conn
 
     def init_db(self) -> None:
         conn = self._get_connection()
+        conn.execute("PRAGMA journal_mode=WAL")
         cursor = conn.cursor()
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS prices (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT NOT NULL,
+                timestamp INTEGER NOT NULL,
+                price REAL NOT NULL
+            )
+        """)
+        self._migrate_text_timestamps(cursor)
+        # Covering index for the ordered history scan (timestamp, price) and
+        # the MAX(timestamp) half of the fingerprint query, so both are
+        # answered from the index without row lookups.
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_prices_timestamp_price ON prices(timestamp, price)")
+        # Incrementally maintained aggregates so get_price_stats is a
+        # single-row read instead of a full-table scan. Single product,
+        # hence the single CHECKed row.
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS price_stats (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                total_entries INTEGER NOT NULL,
+                min_price REAL,
+                max_price REAL,
+                sum_price REAL NOT NULL
+            )
+        """)
+        self.recompute_stats()
+
+    def _migrate_text_timestamps(self, cursor) -> None:
+        """One-time migration of databases created with TEXT timestamps.
+
+        Timestamps are stored as INTEGER Unix seconds so ordering and
+        week-bucketing are integer operations; older databases stored
+        localtime '%Y-%m-%d %H:%M:%S' strings and are rebuilt in place.
+        """
+        cursor.execute("PRAGMA table_info(prices)")
+        column_types = {row[1]: row[2].upper() for row in cursor.fetchall()}
+        if column_types.get("timestamp") != "TEXT":
+            return
+        log_message("Migrating prices.timestamp from TEXT to INTEGER epoch seconds...")
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute("""
+            CREATE TABLE prices_migrated (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp INTEGER NOT NULL,
                 price REAL NOT NULL
             )
         """)
-        conn.commit()
-        conn.close()
+        cursor.execute("""
+            INSERT INTO prices_migrated (id, timestamp, price)
+            SELECT id, CAST(strftime('%s', timestamp, 'utc') AS INTEGER), price FROM prices
+        """)
+        cursor.execute("DROP TABLE prices")
+        cursor.execute("ALTER TABLE prices_migrated RENAME TO prices")
+        cursor.execute("COMMIT")
+
+    def _update_stats_on_insert(self, cursor, count: int, min_price: float, max_price: float, sum_price: float) -> None:
+        """Folds a batch of inserted prices into the price_stats row."""
+        cursor.execute("""
+            INSERT INTO price_stats (id, total_entries, min_price, max_price, sum_price)
+            VALUES (1, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                total_entries = total_entries + excluded.total_entries,
+                min_price = MIN(COALESCE(min_price, excluded.min_price), excluded.min_price),
+                max_price = MAX(COALESCE(max_price, excluded.max_price), excluded.max_price),
+                sum_price = sum_price + excluded.sum_price
+        """, (count, min_price, max_price, sum_price))
 
     def save_price_entry(self, price_value: float) -> None:
         conn = self._get_connection()
         cursor = conn.cursor()
-        current_timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        current_timestamp = int(time.time())
         try:
-            cursor.execute("INSERT INTO prices (timestamp, price) VALUES (?, ?)", (current_timestamp, price_value))
-            conn.commit()
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute(_INSERT_PRICE_SQL, (current_timestamp, price_value))
+            self._update_stats_on_insert(cursor, 1, price_value, price_value, price_value)
+            cursor.execute("COMMIT")
         except sqlite3.Error as e:
             log_message(f"SQLite Error saving price: {e}")
-        finally:
-            conn.close()
+            conn.rollback()
+
+    # Rows pulled per fetchmany() call when streaming the history out.
+    _FETCH_CHUNK_ROWS = 10_000
 
     def get_all_price_entries_df(self) -> pd.DataFrame:
+        # Built on the streamed arrays rather than pd.read_sql_query, which
+        # materializes the result several times (rows -> list -> DataFrame).
+        timestamps, prices = self.get_all_price_entries_arrays()
+        # Parse the date column to datetime64 here, once, with an explicit
+        # format so consumers never re-run string inference per call.
+        dates = pd.to_datetime(timestamps, format="%Y-%m-%d %H:%M:%S")
+        return pd.DataFrame({"date": dates, "price": prices}, copy=False)
+
+    def get_all_price_entries_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        timestamps: list = []
+        prices: list = []
+        for rows in self.iter_price_entry_chunks(self._FETCH_CHUNK_ROWS):
+            ts_chunk, price_chunk = zip(*rows)
+            timestamps.extend(ts_chunk)
+            prices.extend(price_chunk)
+        if not timestamps:
+            return np.empty(0, dtype=object), np.empty(0, dtype=np.float64)
+        return np.asarray(timestamps, dtype=object), np.asarray(prices, dtype=np.float64)
+
+    def iter_price_entry_chunks(self, chunk_rows: int) -> Iterator[List[Tuple[str, float]]]:
         conn = self._get_connection()
         try:
-            df = pd.read_sql_query("SELECT timestamp as date, price FROM prices ORDER BY timestamp ASC", conn)
-        except (pd.io.sql.DatabaseError, sqlite3.Error) as e:
-            log_message(f"SQLite Error loading price history to DataFrame: {e}")
-            df = pd.DataFrame(columns=["date", "price"])
-        finally:
-            conn.close()
-        return df
+            cursor = conn.execute(
+                "SELECT datetime(timestamp, 'unixepoch', 'localtime'), price FROM prices ORDER BY timestamp ASC"
+            )
+            cursor.arraysize = chunk_rows
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    break
+                yield rows
+        except sqlite3.Error as e:
+            log_message(f"SQLite Error iterating price history: {e}")
 
     def get_latest_price_entry(self) -> Optional[Tuple[str, float]]:
         conn = self._get_connection()
         cursor = conn.cursor()
         try:
-            cursor.execute("SELECT timestamp, price FROM prices ORDER BY id DESC LIMIT 1")
+            cursor.execute(
+                "SELECT datetime(timestamp, 'unixepoch', 'localtime'), price FROM prices ORDER BY id DESC LIMIT 1"
+            )
             row = cursor.fetchone()
             return row if row else None
         except sqlite3.Error as e:
             log_message(f"SQLite Error fetching latest price: {e}")
             return None
-        finally:
-            conn.close()
+
+    def get_history_fingerprint(self) -> Optional[Tuple[Any, int]]:
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT MAX(timestamp), COUNT(*) FROM prices")
+            max_ts, count = cursor.fetchone()
+            return (max_ts, count) if count else None
+        except sqlite3.Error as e:
+            log_message(f"SQLite Error fetching history fingerprint: {e}")
+            return None
 
     def delete_all_prices(self) -> None:
         conn = self._get_connection()
         cursor = conn.cursor()
         try:
+            cursor.execute("BEGIN IMMEDIATE")
             cursor.execute("DELETE FROM prices")
-            conn.commit()
+            cursor.execute("DELETE FROM price_stats")
+            cursor.execute("COMMIT")
             log_message("All price entries deleted from SQLite.")
         except sqlite3.Error as e:
             log_message(f"SQLite Error deleting all prices: {e}")
             conn.rollback()
-        finally:
-            conn.close()
+
+    def compact_history(self) -> int:
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        try:
+            # Weeks with a single distinct price keep only their earliest row;
+            # the whole reduction runs inside SQLite instead of round-tripping
+            # the table through pandas and rewriting it. The week bucket is
+            # pure integer math on the epoch column — (ts + 259200) / 604800
+            # shifts the epoch so buckets start on Mondays (1970-01-01 was a
+            # Thursday) — which avoids strftime formatting a string per row.
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute("""
+                WITH weeks AS (
+                    SELECT (timestamp + 259200) / 604800 AS wk,
+                           MIN(id) AS first_id,
+                           COUNT(DISTINCT price) AS distinct_prices
+                    FROM prices
+                    GROUP BY wk
+                )
+                DELETE FROM prices WHERE id IN (
+                    SELECT p.id
+                    FROM prices p
+                    JOIN weeks w ON (p.timestamp + 259200) / 604800 = w.wk
+                    WHERE w.distinct_prices = 1 AND p.id <> w.first_id
+                )
+            """)
+            # cursor.rowcount is -1 for WITH-prefixed DML, so ask SQLite directly.
+            removed = cursor.execute("SELECT changes()").fetchone()[0]
+            cursor.execute("COMMIT")
+            if removed:
+                self.recompute_stats()
+            return removed
+        except sqlite3.Error as e:
+            log_message(f"SQLite Error compacting price history: {e}")
+            conn.rollback()
+            return 0
+
+    @staticmethod
+    def _to_epoch(ts) -> int:
+        """Coerce a timestamp to Unix seconds; accepts legacy string form."""
+        if isinstance(ts, str):
+            return int(datetime.strptime(ts, '%Y-%m-%d %H:%M:%S').timestamp())
+        return int(ts)
+
+    # Rows per compound INSERT statement during bulk loads. Two parameters per
+    # row keeps this comfortably below SQLite's 32766-parameter limit.
+    _BULK_ROWS_PER_STMT = 1000
 
     def bulk_insert_prices(self, price_entries: List[Dict[str, Any]]) -> None:
         conn = self._get_connection()
         cursor = conn.cursor()
         try:
-            data_to_insert = [(entry['timestamp'], entry['price']) for entry in price_entries]
-            cursor.executemany("INSERT INTO prices (timestamp, price) VALUES (?, ?)", data_to_insert)
-            conn.commit()
-            log_message(f"Bulk inserted {len(data_to_insert)} price entries into SQLite.")
+            # Multi-row VALUES statements amortize SQLite's per-statement
+            # stepping cost; all chunks share one transaction/commit.
+            rows_per_stmt = min(len(price_entries), self._BULK_ROWS_PER_STMT)
+            if rows_per_stmt:
+                cursor.execute("BEGIN IMMEDIATE")
+                placeholders = ",".join(["(?, ?)"] * rows_per_stmt)
+                min_price = max_price = price_entries[0]['price']
+                sum_price = 0.0
+                for start in range(0, len(price_entries), rows_per_stmt):
+                    chunk = price_entries[start:start + rows_per_stmt]
+                    if len(chunk) != rows_per_stmt:
+                        placeholders = ",".join(["(?, ?)"] * len(chunk))
+                    flat_params = [value for entry in chunk for value in (self._to_epoch(entry['timestamp']), entry['price'])]
+                    cursor.execute(f"INSERT INTO prices (timestamp, price) VALUES {placeholders}", flat_params)
+                    # Aggregate stats per chunk instead of materializing one
+                    # full-size list of prices at the end.
+                    chunk_prices = flat_params[1::2]
+                    min_price = min(min_price, min(chunk_prices))
+                    max_price = max(max_price, max(chunk_prices))
+                    sum_price += sum(chunk_prices)
+                self._update_stats_on_insert(cursor, len(price_entries), min_price, max_price, sum_price)
+                cursor.execute("COMMIT")
+            log_message(f"Bulk inserted {len(price_entries)} price entries into SQLite.")
         except sqlite3.Error as e:
             log_message(f"SQLite Error bulk inserting prices: {e}")
             conn.rollback()
-        finally:
-            conn.close()
 
     def get_price_stats(self) -> Dict[str, Any]:
         conn = self._get_connection()
         try:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT
-                    COUNT(price),
-                    MIN(price),
-                    MAX(price),
-                    AVG(price)
-                FROM prices
-                WHERE price IS NOT NULL
-            """)
-            stats = cursor.fetchone()
-            count, min_price, max_price, avg_price = stats if stats else (0, None, None, None)
-            
+            cursor.execute("SELECT total_entries, min_price, max_price, sum_price FROM price_stats WHERE id = 1")
+            row = cursor.fetchone()
+            count, min_price, max_price, sum_price = row if row else (0, None, None, 0.0)
+
             if count == 0:
                 return {"total_entries": 0, "min_price": None, "max_price": None, "average_price": None}
             return {
                 "total_entries": count,
                 "min_price": min_price,
                 "max_price": max_price,
-                "average_price": round(avg_price, 2) if avg_price is not None else None
+                "average_price": round(sum_price / count, 2)
             }
         except sqlite3.Error as e:
             log_message(f"SQLite Database error calculating stats: {str(e)}")
             # Consider re-raising a custom DB error or returning a default error structure
             raise # Re-raise to be handled by service/API layer
-        finally:
-            conn.close()
\ No newline at end of file
+
+    def recompute_stats(self) -> None:
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                INSERT OR REPLACE INTO price_stats (id, total_entries, min_price, max_price, sum_price)
+                SELECT 1, COUNT(price), MIN(price), MAX(price), COALESCE(SUM(price), 0)
+                FROM prices
+                WHERE price IS NOT NULL
+            """)
+        except sqlite3.Error as e:
+            log_message(f"SQLite Error recomputing price stats: {e}")
+            conn.rollback()
\ No newline at end of file
@@ -5,11 +5,25 @@ from app.api.endpoints import app_router
 from app.tasks.price_monitor_task import watch_prices_task
 from app.core.config import settings
 from app.crud import price_crud_handler # Import the handler
-from fastapi import FastAPI
+from app.utils.logging_utils import log_message
+from fastapi import FastAPI, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 
-app = FastAPI(title="Price Watcher API")
+# ORJSONResponse serializes responses with orjson (Rust) instead of the
+# stdlib json module, which matters for the /history/text payload.
+app = FastAPI(title="Price Watcher API", default_response_class=ORJSONResponse)
+# Price-history JSON is highly repetitive (keys + ISO timestamps), so gzip
+# shrinks it roughly an order of magnitude for clients that accept it.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 app.include_router(app_router)
 
+@app.exception_handler(Exception)
+async def unhandled_exception_handler(request: Request, exc: Exception):
+    """Single 500 handler replacing the per-endpoint try/except blocks."""
+    log_message(f"API Error in {request.url.path}: {exc}")
+    return ORJSONResponse(status_code=500, content={"detail": str(exc)})
+
 async def main():
     print(f"Starting price-watcher. API and monitor for product: {settings.PRODUCT_URL}")
     price_crud_handler.init_db() # Initialize database at startup via the handler
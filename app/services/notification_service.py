@@ -1,7 +1,14 @@
 import requests
+from requests.adapters import HTTPAdapter
+from requests_toolbelt import MultipartEncoder
 from app.core.config import settings
 from app.utils.logging_utils import log_message
 
+# Reused session keeps the TLS connection to api.telegram.org alive across
+# the sendMessage/sendPhoto pair and across alerts.
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(pool_connections=2, pool_maxsize=4))
+
 def send_telegram_message(message: str, image_path: str | None = None):
     """Send Telegram message and, optionally, a graphic image."""
     if not settings.TELEGRAM_TOKEN or not settings.TELEGRAM_CHAT_ID:
@@ -9,10 +16,12 @@ def send_telegram_message(message: str, image_path: str | None = None):
         return
 
     url_text = f'https://api.telegram.org/bot{settings.TELEGRAM_TOKEN}/sendMessage'
-    params_text = {'chat_id': settings.TELEGRAM_CHAT_ID, 'text': message}
-    
+    # JSON body instead of query params: no URL-encoding pass and no URL
+    # length ceiling on long alert texts.
+    payload_text = {'chat_id': settings.TELEGRAM_CHAT_ID, 'text': message}
+
     try:
-        response = requests.post(url_text, params=params_text, timeout=10)
+        response = _SESSION.post(url_text, json=payload_text, timeout=10)
         response.raise_for_status()
         log_message("Telegram message sent successfully.")
     except requests.exceptions.RequestException as e:
@@ -22,9 +31,18 @@ def send_telegram_message(message: str, image_path: str | None = None):
         url_photo = f'https://api.telegram.org/bot{settings.TELEGRAM_TOKEN}/sendPhoto'
         try:
             with open(image_path, 'rb') as photo_file:
-                files = {'photo': photo_file}
-                params_photo = {'chat_id': settings.TELEGRAM_CHAT_ID}
-                photo_response = requests.post(url_photo, params=params_photo, files=files, timeout=20)
+                # MultipartEncoder streams the file from disk instead of
+                # letting requests buffer the whole multipart body in memory.
+                encoder = MultipartEncoder(fields={
+                    'chat_id': str(settings.TELEGRAM_CHAT_ID),
+                    'photo': ('price_history.png', photo_file, 'image/png'),
+                })
+                photo_response = _SESSION.post(
+                    url_photo,
+                    data=encoder,
+                    headers={'Content-Type': encoder.content_type},
+                    timeout=20,
+                )
                 photo_response.raise_for_status()
             log_message("Image sent successfully to Telegram.")
         except (requests.exceptions.RequestException, FileNotFoundError) as e:
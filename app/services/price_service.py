@@ -1,37 +1,88 @@
+import time
+
 import pandas as pd
 from app.crud import price_crud_handler # Use the abstracted handler
 from app.services import scraping_service, notification_service, reporting_service
 from app.core.config import settings
 from app.utils.logging_utils import log_message
 
+# TTL-memoized read results so repeated API hits between scrape iterations
+# don't re-run aggregate queries. Entries are (expires_at, value) tuples and
+# are dropped whenever a new price is saved.
+_STATS_TTL_SECONDS = settings.DELAY_SECONDS
+_LATEST_TTL_SECONDS = min(settings.DELAY_SECONDS, 30)
+_stats_cache: tuple[float, dict] | None = None
+_latest_cache: tuple[float, tuple | None] | None = None
+
+# Last price this process saved. The watcher is the only writer, so after the
+# first iteration seeds it from the database the drop/increase comparison
+# never needs a pre-save SELECT again. _UNSET distinguishes "not loaded yet"
+# from "empty history" (None).
+_UNSET = object()
+_last_saved_price = _UNSET
+
+def _invalidate_read_caches():
+    """Drop memoized stats/latest-price results after a write."""
+    global _stats_cache, _latest_cache
+    _stats_cache = None
+    _latest_cache = None
+
 def get_price_statistics() -> dict:
-    """Get price statistics from the database."""
-    return price_crud_handler.get_price_stats()
+    """Get price statistics from the database (memoized with a TTL)."""
+    global _stats_cache
+    now = time.monotonic()
+    if _stats_cache is not None and now < _stats_cache[0]:
+        return _stats_cache[1]
+    stats = price_crud_handler.get_price_stats()
+    _stats_cache = (now + _STATS_TTL_SECONDS, stats)
+    return stats
 
 def get_all_prices_df() -> pd.DataFrame:
     """Get all price entries as a DataFrame."""
     return price_crud_handler.get_all_price_entries_df()
 
+def get_all_prices_arrays():
+    """Get all price entries as (timestamps, prices) numpy arrays."""
+    return price_crud_handler.get_all_price_entries_arrays()
+
+def iter_price_chunks(chunk_rows: int):
+    """Iterate (timestamp, price) rows in chronological chunks."""
+    return price_crud_handler.iter_price_entry_chunks(chunk_rows)
+
 def get_latest_price() -> tuple | None:
-    """Get the latest price entry."""
-    return price_crud_handler.get_latest_price_entry()
+    """Get the latest price entry (memoized with a TTL)."""
+    global _latest_cache
+    now = time.monotonic()
+    if _latest_cache is not None and now < _latest_cache[0]:
+        return _latest_cache[1]
+    latest = price_crud_handler.get_latest_price_entry()
+    _latest_cache = (now + _LATEST_TTL_SECONDS, latest)
+    return latest
+
+def process_new_price_iteration() -> bool:
+    """Fetches current price, saves it, and sends notification if price dropped.
 
-def process_new_price_iteration():
-    """Fetches current price, saves it, and sends notification if price dropped."""
+    Returns True if a price was obtained and saved, False on a failed scrape
+    so the caller can back off.
+    """
     log_message("Starting new price iteration process...")
     product_name, current_price = scraping_service.get_product_info()
 
     if current_price is None or product_name is None:
         log_message("Could not obtain product name or price. Skipping iteration.")
-        return
+        return False
+
+    global _last_saved_price
+    if _last_saved_price is _UNSET:
+        latest_entry_before_save = price_crud_handler.get_latest_price_entry()
+        previous_latest_price = latest_entry_before_save[1] if latest_entry_before_save else None
+    else:
+        previous_latest_price = _last_saved_price
 
-    latest_entry_before_save = price_crud.get_latest_price_entry()
-    previous_latest_price = latest_entry_before_save[1] if latest_entry_before_save else None
-    
     price_crud_handler.save_price_entry(current_price)
+    _last_saved_price = current_price
+    _invalidate_read_caches()
     log_message(f"Saved current price for {product_name}: {current_price}€")
-    
-    graph_path = reporting_service.generate_price_history_graph()
 
     if previous_latest_price is not None:
         if current_price < previous_latest_price:
@@ -44,6 +95,10 @@ def process_new_price_iteration():
                 f"Check it out: {settings.PRODUCT_URL}"
             )
             log_message(f"Price drop detected for {product_name}: {previous_latest_price}€ -> {current_price}€")
+            # The graph is only rendered here — the sole branch that sends it.
+            # /history/image regenerates on demand, so no-change iterations
+            # skip matplotlib entirely.
+            graph_path = reporting_service.generate_price_history_graph()
             notification_service.send_telegram_message(message, image_path=graph_path)
         elif current_price > previous_latest_price:
             log_message(f"Price increase for {product_name}: {previous_latest_price}€ -> {current_price}€")
@@ -53,29 +108,15 @@ def process_new_price_iteration():
         log_message(f"First price entry for {product_name}: {current_price}€")
         # Optionally send a notification for the first price entry
         # notification_service.send_telegram_message(f"Now tracking {product_name} at {current_price}€.", image_path=graph_path)
+    return True
 
 def clean_price_history():
     """Reduce database size by keeping only the first price entry for a week if prices were unchanged that week."""
     log_message("Attempting to clean price history...")
-    df_all_history = price_crud_handler.get_all_price_entries_df() # 'date' column is timestamp
-
-    if df_all_history.empty:
-        log_message("Price history is empty, skipping cleanup.")
-        return
-
-    df_all_history['datetime_obj'] = pd.to_datetime(df_all_history['date'])
-    df_all_history['week_num'] = df_all_history['datetime_obj'].dt.strftime('%Y-%W') # %W for week number (Monday as first day)
-
-    rows_to_keep_df = df_all_history.groupby('week_num').apply(
-        lambda g: g.iloc[0] if g['price'].nunique() == 1 else g
-    ).reset_index(drop=True)
-
-    # Prepare data for bulk insert (timestamp and price)
-    rows_to_keep_list = [{'timestamp': row['date'], 'price': row['price']} for _, row in rows_to_keep_df.iterrows()]
+    removed = price_crud_handler.compact_history()
 
-    if rows_to_keep_list:
-        price_crud_handler.delete_all_prices()
-        price_crud_handler.bulk_insert_prices(rows_to_keep_list)
-        log_message(f"Price history cleaned. Original: {len(df_all_history)}, Reduced: {len(rows_to_keep_df)}")
+    if removed:
+        _invalidate_read_caches()
+        log_message(f"Price history cleaned. Removed {removed} redundant entries.")
     else:
-        log_message("No data to keep after processing for cleanup, or an error occurred.")
\ No newline at end of file
+        log_message("Price history already compact; nothing to clean.")
\ No newline at end of file
@@ -1,32 +1,71 @@
-import matplotlib
-matplotlib.use('Agg') # Set the backend before importing pyplot
-import matplotlib.pyplot as plt
-import pandas as pd
+import threading
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import numpy as np
 import os
 from app.core.config import settings
 from app.crud import price_crud_handler # Use the abstracted handler
 from app.utils.logging_utils import log_message
 
+# One Figure/Agg canvas reused for every render instead of a fresh pyplot
+# figure per call; pyplot's global state machine is bypassed entirely. The
+# lock serializes renders, since the watcher thread and API worker threads
+# can both ask for a graph.
+_FIG = Figure(figsize=(10, 6))
+_CANVAS = FigureCanvasAgg(_FIG)
+_AX = _FIG.add_subplot(111)
+_RENDER_LOCK = threading.Lock()
+
+
+# Fingerprint of the history the current PNG was rendered from; rendering is
+# skipped while it matches, so repeat calls only cost one cheap SELECT.
+_graph_fingerprint: tuple | None = None
+
+# Longest series matplotlib is asked to rasterize; longer histories are
+# downsampled to this many evenly spaced points, which is denser than the
+# figure has pixels anyway.
+_GRAPH_MAX_POINTS = 2000
 
 
 def generate_price_history_graph() -> str | None:
-    """Generate a graph of price history and save it. Returns the path to the image or None."""
+    """Generate a graph of price history and save it. Returns the path to the image or None.
+
+    The render is memoized on a (latest timestamp, row count) fingerprint of
+    the price table: if the history has not changed since the last render and
+    the PNG still exists, the cached image path is returned immediately.
+    """
+    global _graph_fingerprint
+    fingerprint = price_crud_handler.get_history_fingerprint()
+    if fingerprint is None:
+        log_message("No data to generate price history graph.")
+        return None
+    if fingerprint == _graph_fingerprint and os.path.exists(settings.HISTORY_IMAGE_PATH):
+        return settings.HISTORY_IMAGE_PATH
+
     df = price_crud_handler.get_all_price_entries_df()
     if df.empty:
         log_message("No data to generate price history graph.")
         return None
 
-    plt.figure(figsize=(10, 6))
-    plt.plot(pd.to_datetime(df['date']), df['price'], marker='o', linestyle='-')
-    plt.title('Price Evolution')
-    plt.xlabel('Date')
-    plt.ylabel('Price (€)')
-    plt.grid(True)
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    
+    dates = df['date']  # already datetime64 from the CRUD layer
+    prices = df['price']
+    if len(df) > _GRAPH_MAX_POINTS:
+        idx = np.linspace(0, len(df) - 1, _GRAPH_MAX_POINTS, dtype=int)
+        dates = dates.iloc[idx]
+        prices = prices.iloc[idx]
+
     os.makedirs(os.path.dirname(settings.HISTORY_IMAGE_PATH), exist_ok=True)
-    plt.savefig(settings.HISTORY_IMAGE_PATH)
-    plt.close() # Close the plot to free memory
+    with _RENDER_LOCK:
+        _AX.clear()
+        _AX.plot(dates, prices, marker='o', linestyle='-')
+        _AX.set_title('Price Evolution')
+        _AX.set_xlabel('Date')
+        _AX.set_ylabel('Price (€)')
+        _AX.grid(True)
+        _AX.tick_params(axis='x', rotation=45)
+        _FIG.tight_layout()
+        _CANVAS.print_png(settings.HISTORY_IMAGE_PATH)
+    _graph_fingerprint = fingerprint
     log_message(f"Price history graph generated: {settings.HISTORY_IMAGE_PATH}")
     return settings.HISTORY_IMAGE_PATH
\ No newline at end of file
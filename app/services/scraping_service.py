@@ -1,29 +1,53 @@
+import re
+
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from selectolax.lexbor import LexborHTMLParser
 from app.core.config import settings
 from app.utils.logging_utils import log_message
 
+# Module-level session so every poll reuses the keep-alive socket to the
+# product host instead of paying a fresh TCP+TLS handshake per iteration.
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
+_SESSION.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+# Grabs the numeric span (digits plus separators) in one C-level search,
+# tolerating surrounding currency symbols. Whitespace — including the NBSP
+# and narrow-NBSP thousands separators European shops render — is allowed
+# inside the span and stripped out afterwards.
+_PRICE_EXTRACT = re.compile(r'(\d[\d.,\s\u00a0\u202f]*\d|\d)')
+_PRICE_WS = re.compile(r'[\s\u00a0\u202f]+')
+
+def _extract_price_str(raw_price: str) -> str | None:
+    """Pull the numeric value out of a scraped price string, or None."""
+    match = _PRICE_EXTRACT.search(raw_price)
+    if not match:
+        return None
+    return _PRICE_WS.sub('', match.group(1)).replace(",", ".")
+
 def get_product_info() -> tuple[str | None, float | None]:
     """Get price and product name from the configured URL."""
     log_message(f"Getting info from {settings.PRODUCT_URL}...")
     try:
-        response = requests.get(settings.PRODUCT_URL, timeout=10)
+        response = _SESSION.get(settings.PRODUCT_URL, timeout=10)
         response.raise_for_status()  # Raise HTTPError for bad responses (4xx or 5xx)
     except requests.exceptions.RequestException as e:
         log_message(f"Error getting webpage: {e}")
         return None, None
 
-    soup = BeautifulSoup(response.text, "html.parser")
-    
-    price_element = soup.select(settings.PRODUCT_PRICE_SELECTOR)
+    # The Lexbor backend parses the raw bytes directly (no .text decode pass)
+    # and only materializes Python wrappers for the nodes css_first touches,
+    # so unrelated parts of large pages stay in C memory.
+    tree = LexborHTMLParser(response.content)
+
+    price_element = tree.css_first(settings.PRODUCT_PRICE_SELECTOR)
     price_str = None
     if price_element:
-        raw_price = price_element[0].text.strip()
-        cleaned_price = ''.join(filter(lambda x: x.isdigit() or x == '.' or x == ',', raw_price))
-        price_str = cleaned_price.replace(",", ".")
+        price_str = _extract_price_str(price_element.text(strip=True))
 
-    product_name_element = soup.select(settings.PRODUCT_NAME_SELECTOR)
-    product_name = product_name_element[0].text.strip() if product_name_element else None
+    product_name_element = tree.css_first(settings.PRODUCT_NAME_SELECTOR)
+    product_name = product_name_element.text(strip=True) if product_name_element else None
 
     if not product_name:
         log_message("Product name not found.")
@@ -4,25 +4,47 @@ from app.services import price_service
 from app.utils.logging_utils import log_message
 # No direct CRUD import needed here if init_db is handled by main and services use the handler
 
+# Ceiling for the failure backoff below.
+_MAX_BACKOFF_SECONDS = 3600
+
 async def watch_prices_task():
     """Main async task to periodically check prices and perform maintenance."""
     log_message("Price watcher task started.")
     # Initialization is handled in main.py via price_crud_handler
 
     iteration = 0
+    fail_count = 0
     while True:
         iteration += 1
         log_message(f"Price monitor task: Starting iteration {iteration}...")
-        
+
         try:
-            price_service.process_new_price_iteration()
+            # The iteration does blocking HTTP + sqlite + matplotlib work;
+            # run it in a worker thread so the event loop (and with it the
+            # API served from the same loop) stays responsive.
+            succeeded = await asyncio.to_thread(price_service.process_new_price_iteration)
+        except Exception as e:
+            succeeded = False
+            log_message(f"Error in watch_prices_task main loop: {e}")
+        fail_count = 0 if succeeded else fail_count + 1
 
-            # Clean history approximately once a day
+        try:
+            # Clean history approximately once a day. Maintenance errors are
+            # logged but deliberately don't feed the scrape backoff.
             iterations_per_day = (24 * 60 * 60) / settings.DELAY_SECONDS if settings.DELAY_SECONDS > 0 else 1440
             if iteration % int(iterations_per_day) == 0:
-                price_service.clean_price_history()
+                await asyncio.to_thread(price_service.clean_price_history)
         except Exception as e:
-            log_message(f"Error in watch_prices_task main loop: {e}")
-            # Add more robust error handling or backoff if needed
+            log_message(f"Error cleaning price history: {e}")
 
-        await asyncio.sleep(settings.DELAY_SECONDS)
+        # Exponential backoff while scrapes fail, so an origin outage or
+        # rate limit isn't hammered at the normal cadence. The cap only
+        # applies while backing off — a DELAY_SECONDS above the ceiling
+        # (e.g. a daily check) keeps its configured cadence.
+        if fail_count:
+            delay = min(settings.DELAY_SECONDS * 2 ** fail_count,
+                        max(_MAX_BACKOFF_SECONDS, settings.DELAY_SECONDS))
+            log_message(f"Scrape failing ({fail_count} in a row); next attempt in {delay}s.")
+        else:
+            delay = settings.DELAY_SECONDS
+        await asyncio.sleep(delay)
@@ -1,15 +1,64 @@
+import atexit
+import logging
+import logging.handlers
 import os
-import time
+import queue
+
 from app.core.config import settings
 
-def log_message(message: str):
-    """Save message in log file with rotation."""
-    log_dir = os.path.dirname(settings.LOG_FILE)
-    os.makedirs(log_dir, exist_ok=True)
+# Stdlib rotating handler keeps one file descriptor open and checks size via
+# the open stream, instead of the previous stat/truncate/open dance costing
+# three syscalls per message.
+os.makedirs(os.path.dirname(settings.LOG_FILE), exist_ok=True)
+
+_file_handler = logging.handlers.RotatingFileHandler(
+    settings.LOG_FILE,
+    maxBytes=settings.MAX_LOG_SIZE,
+    backupCount=1,
+    encoding="utf-8",
+)
+class _CachedTimestampFormatter(logging.Formatter):
+    """Formatter that reuses the rendered timestamp within the same second.
+
+    Log lines only carry second granularity, so strftime (locale-aware C
+    code) needs to run at most once per second even under bursty logging.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._last_sec: int = -1
+        self._last_str: str = ""
+
+    def formatTime(self, record, datefmt=None):
+        sec = int(record.created)
+        if sec != self._last_sec:
+            self._last_str = super().formatTime(record, datefmt)
+            self._last_sec = sec
+        return self._last_str
 
-    # Rotate log
-    if os.path.exists(settings.LOG_FILE) and os.path.getsize(settings.LOG_FILE) > settings.MAX_LOG_SIZE:
-        open(settings.LOG_FILE, "w").close() # Simple rotation: clear file
+_file_handler.setFormatter(
+    _CachedTimestampFormatter("%(asctime)s - %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+)
 
-    with open(settings.LOG_FILE, "a", encoding="utf-8") as log_file:
-        log_file.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} - {message}\n")
\ No newline at end of file
+# Callers only enqueue the record; a background QueueListener thread does the
+# formatting and disk write, so slow disks or rotation never stall the
+# watcher loop or API workers.
+_queue: queue.Queue = queue.Queue(maxsize=10_000)
+_listener = logging.handlers.QueueListener(_queue, _file_handler, respect_handler_level=True)
+_listener.start()
+
+def _stop_listener():
+    # stop() is not idempotent before Python 3.13; guard the atexit hook.
+    if _listener._thread is not None:
+        _listener.stop()
+
+atexit.register(_stop_listener)
+
+_logger = logging.getLogger("price_watcher")
+_logger.setLevel(logging.INFO)
+_logger.addHandler(logging.handlers.QueueHandler(_queue))
+_logger.propagate = False
+
+def log_message(message: str):
+    """Save message in log file with rotation."""
+    _logger.info(message)
@@ -0,0 +1,2 @@
+# Present so pytest's rootdir (and with it the `app` package) lands on
+# sys.path regardless of how pytest is invoked.
@@ -0,0 +1,17 @@
+import pytest
+
+from app.services.scraping_service import _extract_price_str
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("1\xa0299,00 €", "1299.00"),   # NBSP thousands separator
+    ("1 234,56 €", "1234.56"), # narrow-NBSP thousands separator
+    ("1 234,56 €", "1234.56"),      # plain-space thousands separator
+    ("  1,99 €", "1.99"),
+    ("USD 12.50", "12.50"),
+    ("999€", "999"),
+    ("from 5€", "5"),
+    ("no price", None),
+])
+def test_extract_price_str(raw, expected):
+    assert _extract_price_str(raw) == expected